@@ -2,7 +2,10 @@ import json
 import logging
 from typing import Any, Optional
 
-import requests
+import aiohttp
+
+from utils import jsonio
+from utils.http import SESSION
 
 
 logger = logging.getLogger(__name__)
@@ -13,7 +16,7 @@ get_event_by_event_ticker_url = f"{kalshi_baseurl}/events/{{event_ticker}}"
 
 
 def get_kalshi_markets() -> list[dict]:
-    response = requests.get(get_markets_url)
+    response = SESSION.get(get_markets_url)
     return response.json().get("markets", [])
 
 
@@ -27,10 +30,16 @@ def get_event_ticker_by_title(title: str) -> Optional[str]:
 
 def get_event_by_event_ticker(event_ticker: str) -> Any:
     url = get_event_by_event_ticker_url.format(event_ticker=event_ticker)
-    response = requests.get(url)
+    response = SESSION.get(url)
     return response.json()
 
 
+async def get_event_by_event_ticker_async(session: aiohttp.ClientSession, event_ticker: str) -> Any:
+    url = get_event_by_event_ticker_url.format(event_ticker=event_ticker)
+    async with session.get(url) as response:
+        return jsonio.loads(await response.read())
+
+
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
     event = get_event_by_event_ticker("KXPOWELLMENTION-25OCT15")
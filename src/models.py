@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Optional
 
 
 @dataclass(slots=True)
@@ -23,6 +23,17 @@ class MarketPair:
     kalshi_title: Optional[str] = None
 
 
+@dataclass(slots=True)
+class ParsedMarket:
+    """A sub-market quote parsed from a Polymarket/Kalshi event response (prices in 0~1 USD)."""
+
+    id: str
+    title: str
+    bid: float
+    ask: float
+    raw: Optional[dict[str, Any]] = None
+
+
 @dataclass(slots=True)
 class MonitoringConfig:
     polling_interval_seconds: int
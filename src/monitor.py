@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import logging
 import math
@@ -15,9 +16,10 @@ from rich import box
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
+from rich.text import Text
 
 from logger_setup import setup_logging
-from models import AppConfig, MarketPair, TelegramSettings
+from models import AppConfig, MarketPair, ParsedMarket, TelegramSettings
 from monitor_windows import OpportunityWindowManager
 from utils import config_loader
 from utils.fees import kalshi_fee
@@ -39,14 +41,17 @@ class SnapshotStatus(Enum):
     OPEN = "Open"
 
     @property
-    def rich_label(self) -> str:
-        mapping = {
-            SnapshotStatus.FAILED: "[red]❌ Failed",
-            SnapshotStatus.SKIPPED: "[yellow]Skipped",
-            SnapshotStatus.IDLE: "[dim]Idle",
-            SnapshotStatus.OPEN: "[green]Open",
-        }
-        return mapping[self]
+    def rich_label(self) -> Text:
+        return _STATUS_LABELS[self]
+
+
+# Pre-styled status cells, built once so redraws skip rich markup parsing.
+_STATUS_LABELS = {
+    SnapshotStatus.FAILED: Text("❌ Failed", style="red"),
+    SnapshotStatus.SKIPPED: Text("Skipped", style="yellow"),
+    SnapshotStatus.IDLE: Text("Idle", style="dim"),
+    SnapshotStatus.OPEN: Text("Open", style="green"),
+}
 
 
 @dataclass(slots=True)
@@ -69,7 +74,7 @@ class SnapshotRow:
             "status": self.status.value,
         }
 
-    def table_values(self) -> tuple[str, str, str, str, str]:
+    def table_values(self) -> tuple[str, str, str, str, Text]:
         def fmt(value: Optional[float]) -> str:
             return "-" if value is None else f"{value:.3f}"
 
@@ -135,12 +140,15 @@ class FailureTracker:
         self.counts.pop(key, None)
 
 
+_TITLE_DASHES = str.maketrans({"–": "-", "—": "-"})
+
+
+@functools.lru_cache(maxsize=4096)
 def normalize_title(title: str | None) -> str:
     if not title:
         return ""
-    normalised = title.strip().lower()
-    for needle, replacement in {"–": "-", "—": "-", "°f": "°", " °": "°"}.items():
-        normalised = normalised.replace(needle, replacement)
+    normalised = title.strip().lower().translate(_TITLE_DASHES)
+    normalised = normalised.replace("°f", "°").replace(" °", "°")
     return " ".join(normalised.split())
 
 
@@ -153,6 +161,7 @@ class ArbitrageMonitor:
 
     POLYMARKET_API = "https://gamma-api.polymarket.com"
     KALSHI_API = "https://api.elections.kalshi.com/trade-api/v2"
+    MAX_CONCURRENT_FETCHES = 10
 
     def __init__(self, config: AppConfig):
         self.config = config
@@ -166,6 +175,8 @@ class ArbitrageMonitor:
         self.window_manager = OpportunityWindowManager()
         self.failure_tracker = FailureTracker()
         self.notifier = self._build_notifier(config.telegram)
+        self._last_table: Table | None = None
+        self._last_table_values: list[tuple[str, str, str, str, Text]] = []
 
     @staticmethod
     def _build_notifier(settings: TelegramSettings | None) -> TelegramNotifier | None:
@@ -181,7 +192,9 @@ class ArbitrageMonitor:
 
     async def run(self) -> None:
         LOGGER.info("🚀 启动套利监控系统...")
-        self.window_manager.load_or_recover()
+        self.window_manager.load_or_recover(
+            {self._pair_key(pair): pair.market_name for pair in self.config.market_pairs}
+        )
 
         interval = self.config.monitoring.polling_interval_seconds
         base_interval = interval
@@ -204,30 +217,68 @@ class ArbitrageMonitor:
                 interval, extended = self._maybe_adjust_interval(interval, base_interval, extended)
                 await asyncio.sleep(interval)
 
+        closed = self.window_manager.close_all(utc_now_iso())
+        if closed:
+            LOGGER.info("已结束 %d 个进行中窗口。", closed)
+        self.window_manager.close()
         LOGGER.info("✅ 监控任务已结束。")
 
     async def _run_iteration(self) -> Table:
         snapshots: list[SnapshotRow] = []
         signals: list[ArbitrageSignal] = []
 
-        for pair in self.config.market_pairs:
-            snapshot, signal = self._evaluate_pair(pair)
+        pairs = self.config.market_pairs
+        poly_events, kalshi_events = await self._fetch_all_markets(pairs)
+        # 同一轮询内的所有记录共用一个时间戳，避免逐对重复格式化
+        timestamp = utc_now_iso()
+
+        for pair in pairs:
+            snapshot, signal = self._evaluate_pair(
+                pair,
+                poly_events[pair.polymarket_token],
+                kalshi_events[pair.kalshi_ticker],
+                timestamp,
+            )
             snapshots.append(snapshot)
             if signal:
                 signals.append(signal)
 
         self.window_manager.maybe_checkpoint()
-        self._log_snapshot(snapshots)
+        self._log_snapshot(snapshots, timestamp)
 
         for signal in signals:
             await self._emit_signal(signal)
 
         return self._build_table(snapshots)
 
-    def _evaluate_pair(self, pair: MarketPair) -> tuple[SnapshotRow, Optional[ArbitrageSignal]]:
-        poly_markets = self.poly_client.fetch_event_markets(pair.polymarket_token)
-        kalshi_markets = self.kalshi_client.fetch_event_markets(pair.kalshi_ticker)
+    async def _fetch_all_markets(
+        self, pairs: Sequence[MarketPair]
+    ) -> tuple[dict[str, list[ParsedMarket]], dict[str, list[ParsedMarket]]]:
+        """Fetch every distinct Polymarket event and Kalshi event once, concurrently."""
 
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_FETCHES)
+
+        async def fetch(func, key: str) -> list[ParsedMarket]:
+            async with semaphore:
+                return await asyncio.to_thread(func, key)
+
+        poly_keys = list(dict.fromkeys(pair.polymarket_token for pair in pairs))
+        kalshi_keys = list(dict.fromkeys(pair.kalshi_ticker for pair in pairs))
+        results = await asyncio.gather(
+            *(fetch(self.poly_client.fetch_event_markets, key) for key in poly_keys),
+            *(fetch(self.kalshi_client.fetch_event_markets, key) for key in kalshi_keys),
+        )
+        poly_events = dict(zip(poly_keys, results[: len(poly_keys)]))
+        kalshi_events = dict(zip(kalshi_keys, results[len(poly_keys) :]))
+        return poly_events, kalshi_events
+
+    def _evaluate_pair(
+        self,
+        pair: MarketPair,
+        poly_markets: list[ParsedMarket],
+        kalshi_markets: list[ParsedMarket],
+        timestamp: str,
+    ) -> tuple[SnapshotRow, Optional[ArbitrageSignal]]:
         if not poly_markets or not kalshi_markets:
             self.failure_tracker.record_failure(pair.id)
             return SnapshotRow(pair=pair, status=SnapshotStatus.FAILED), None
@@ -238,20 +289,18 @@ class ArbitrageMonitor:
             poly_markets,
             target_id=pair.polymarket_market_id,
             fallback_title=pair.polymarket_title or pair.market_name,
-            id_key="id",
         )
         kalshi_market = self._find_market(
             kalshi_markets,
             target_id=pair.kalshi_market_id,
             fallback_title=pair.kalshi_title or pair.market_name,
-            id_key="ticker",
         )
 
         if not poly_market or not kalshi_market:
             return SnapshotRow(pair=pair, status=SnapshotStatus.SKIPPED), None
 
-        poly_bid, poly_ask = poly_market["bid"], poly_market["ask"]
-        kalshi_bid, kalshi_ask = kalshi_market["bid"], kalshi_market["ask"]
+        poly_bid, poly_ask = poly_market.bid, poly_market.ask
+        kalshi_bid, kalshi_ask = kalshi_market.bid, kalshi_market.ask
 
         fee_component = round(kalshi_fee(kalshi_bid) * 2, 4)
         total_cost = self.config.cost_assumptions.gas_fee_per_trade_usd + fee_component
@@ -259,7 +308,6 @@ class ArbitrageMonitor:
         buy_k_sell_p = poly_bid - kalshi_ask - total_cost
         buy_p_sell_k = kalshi_bid - poly_ask - total_cost
 
-        timestamp = utc_now_iso()
         self.window_manager.write_snapshot(
             pair.market_name,
             kalshi_bid,
@@ -272,7 +320,7 @@ class ArbitrageMonitor:
             timestamp,
         )
 
-        pair_key = f"{pair.id}::{pair.kalshi_market_id}::{pair.polymarket_market_id}"
+        pair_key = self._pair_key(pair)
         opened = False
 
         if buy_k_sell_p > 0:
@@ -314,22 +362,23 @@ class ArbitrageMonitor:
         )
         return snapshot, signal
 
+    @staticmethod
+    def _pair_key(pair: MarketPair) -> str:
+        return f"{pair.id}::{pair.kalshi_market_id}::{pair.polymarket_market_id}"
+
     def _find_market(
         self,
-        markets: Iterable[dict],
+        markets: Iterable[ParsedMarket],
         *,
         target_id: str,
         fallback_title: str,
-        id_key: str,
-    ) -> Optional[dict]:
+    ) -> Optional[ParsedMarket]:
         if not target_id:
             return None
 
         normalized_target = str(target_id).lower()
         for market in markets:
-            raw = market.get("raw") or {}
-            candidate = raw.get(id_key) or market.get(id_key)
-            if candidate is not None and str(candidate).lower() == normalized_target:
+            if market.id and market.id.lower() == normalized_target:
                 return market
 
         fallback_normalised = normalize_title(fallback_title)
@@ -337,7 +386,7 @@ class ArbitrageMonitor:
             return None
 
         for market in markets:
-            if normalize_title(market.get("title")) == fallback_normalised:
+            if normalize_title(market.title) == fallback_normalised:
                 return market
         return None
 
@@ -372,12 +421,12 @@ class ArbitrageMonitor:
                 )
             )
 
-    def _log_snapshot(self, rows: Sequence[SnapshotRow]) -> None:
+    def _log_snapshot(self, rows: Sequence[SnapshotRow], generated_at: str) -> None:
         LOGGER.info(
             json.dumps(
                 {
                     "type": "monitor_snapshot",
-                    "generated_at": utc_now_iso(),
+                    "generated_at": generated_at,
                     "rows": [row.to_log_dict() for row in rows],
                 },
                 ensure_ascii=False,
@@ -385,6 +434,11 @@ class ArbitrageMonitor:
         )
 
     def _build_table(self, rows: Sequence[SnapshotRow]) -> Table:
+        values = [row.table_values() for row in rows]
+        # 显示内容与上一帧相同时直接复用上一帧表格
+        if self._last_table is not None and values == self._last_table_values:
+            return self._last_table
+
         table = Table(title="Arbitrage Monitor Snapshot", box=box.MINIMAL_DOUBLE_HEAD)
         table.add_column("Pair ID", justify="left")
         table.add_column("Market", justify="left")
@@ -392,8 +446,10 @@ class ArbitrageMonitor:
         table.add_column("P→K", justify="right")
         table.add_column("Status", justify="center")
 
-        for row in rows:
-            table.add_row(*row.table_values())
+        for row_values in values:
+            table.add_row(*row_values)
+        self._last_table = table
+        self._last_table_values = values
         return table
 
     def _maybe_adjust_interval(self, current: int, base: int, extended: bool) -> tuple[int, bool]:
@@ -9,12 +9,17 @@ monitor_windows.py
 """
 
 import datetime
+import functools
 import time
+import atexit
 import csv
-import json
 import logging
+import sys
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Mapping, Optional
+
+from utils import jsonio
 
 
 # ---------- 日志 ----------
@@ -29,6 +34,8 @@ PRICE_SNAPSHOTS_CSV = DATA_DIR / "price_snapshots.csv"
 OPP_WINDOWS_CSV = DATA_DIR / "opportunity_windows.csv"
 WINDOW_STATE_JSON = DATA_DIR / "window_state.json"
 
+SNAPSHOT_BUFFER_BYTES = 1 << 16
+
 # ---------- CSV 头 ----------
 SNAPSHOT_HEADERS = [
     "timestamp",
@@ -42,6 +49,18 @@ SNAPSHOT_HEADERS = [
     "net_spread_buy_P_sell_K",
 ]
 
+# 检查点只保存恢复所需的最小字段，market_pair 标签在恢复时由配置重建
+STATE_FIELDS = (
+    "window_id",
+    "pair_key",
+    "direction",
+    "start_time",
+    "last_time",
+    "peak_spread",
+    "sum_spread",
+    "observation_count",
+)
+
 WINDOW_HEADERS = [
     "window_id",
     "market_pair",
@@ -57,25 +76,57 @@ WINDOW_HEADERS = [
 
 
 # ---------- 工具函数 ----------
-def _ensure_csv(file_path: Path, headers):
-    """确保 CSV 存在并写入表头"""
-    if not file_path.exists():
-        with file_path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
+def _open_csv(file_path: Path, headers, buffering: int = -1):
+    """以追加模式打开 CSV（进程内常驻），文件为空时写入表头"""
+    fh = file_path.open("a", newline="", encoding="utf-8", buffering=buffering)
+    writer = csv.DictWriter(fh, fieldnames=headers)
+    if fh.tell() == 0:
+        writer.writeheader()
+        fh.flush()
+    return fh, writer
 
 
-def _append_csv_row(file_path: Path, headers, row: Dict):
-    _ensure_csv(file_path, headers)
-    with file_path.open("a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writerow(row)
+# 同一轮询的时间戳与窗口的 start_time 会被反复解析，缓存解析结果
+_parse_iso = functools.lru_cache(maxsize=1024)(datetime.datetime.fromisoformat)
 
 
 def _utc_now_iso() -> str:
     return datetime.datetime.now(datetime.timezone.utc).isoformat()
 
 
+# ---------- 窗口状态 ----------
+@dataclass(slots=True)
+class _Window:
+    """进行中的机会窗口：只保留流式聚合值，无逐条价差列表"""
+
+    window_id: str
+    pair_key: str
+    direction: str
+    start_time: str
+    last_time: str
+    peak_spread: float
+    sum_spread: float
+    observation_count: int
+    market_pair: str = "Unknown"
+
+
+def _window_from_state(state: Mapping, market_pair: str) -> _Window:
+    """从检查点中的（可能不完整的）窗口记录重建窗口，缺失字段取默认值"""
+    start_time = state.get("start_time") or _utc_now_iso()
+    first_spread = state.get("peak_spread", 0.0)
+    return _Window(
+        window_id=state.get("window_id") or f"forced-{int(time.time())}",
+        pair_key=state.get("pair_key", ""),
+        direction=sys.intern(state.get("direction", "K_to_P")),
+        start_time=start_time,
+        last_time=state.get("last_time", start_time),
+        peak_spread=first_spread,
+        sum_spread=state.get("sum_spread", first_spread),
+        observation_count=int(state.get("observation_count", 1)),
+        market_pair=market_pair,
+    )
+
+
 # ---------- 主类 ----------
 class OpportunityWindowManager:
     """
@@ -88,12 +139,22 @@ class OpportunityWindowManager:
     """
 
     def __init__(self, checkpoint_interval_sec: int = 300):
-        self.active_windows: Dict[str, Dict] = {}
+        self.active_windows: Dict[str, _Window] = {}
         self.last_checkpoint_ts = 0.0
         self.checkpoint_interval_sec = checkpoint_interval_sec
 
-        _ensure_csv(PRICE_SNAPSHOTS_CSV, SNAPSHOT_HEADERS)
-        _ensure_csv(OPP_WINDOWS_CSV, WINDOW_HEADERS)
+        # 快照为高频写入：使用较大缓冲区，不逐行 flush，每轮结束时统一落盘
+        self._snapshot_fh, self._snapshot_writer = _open_csv(
+            PRICE_SNAPSHOTS_CSV, SNAPSHOT_HEADERS, buffering=SNAPSHOT_BUFFER_BYTES
+        )
+        self._window_fh, self._window_writer = _open_csv(OPP_WINDOWS_CSV, WINDOW_HEADERS)
+        atexit.register(self.close)
+
+    def close(self):
+        """关闭常驻的 CSV 文件句柄"""
+        for fh in (self._snapshot_fh, self._window_fh):
+            if not fh.closed:
+                fh.close()
 
     # ---------- 工具 ----------
     @staticmethod
@@ -109,57 +170,77 @@ class OpportunityWindowManager:
 
     # ---------- 核心 ----------
     def _new_window(self, pair_key: str, direction: str, market_pair_label: str,
-                    start_iso: str, first_spread: float) -> Dict:
+                    start_iso: str, first_spread: float) -> _Window:
         window_id = f"{hash(pair_key) & 0xffffffff:x}-{direction}-{int(time.time())}"
-        return {
-            "window_id": window_id,
-            "pair_key": pair_key,
-            "market_pair": market_pair_label,
-            "direction": direction,
-            "start_time": start_iso,
-            "last_time": start_iso,
-            "peak_spread": first_spread,
-            "sum_spread": first_spread,
-            "observation_count": 1,
-        }
+        return _Window(
+            window_id=window_id,
+            pair_key=pair_key,
+            direction=direction,
+            start_time=start_iso,
+            last_time=start_iso,
+            peak_spread=first_spread,
+            sum_spread=first_spread,
+            observation_count=1,
+            market_pair=market_pair_label,
+        )
 
     def open_or_update(self, pair_key: str, direction: str,
                        market_pair_label: str, spread_val: float, now_iso: str):
+        # 每对每轮调用：字典绑定为局部变量，只查找一次
+        active = self.active_windows
         wk = self._window_key(pair_key, direction)
-        w = self.active_windows.get(wk)
+        w = active.get(wk)
         if w is None:
-            self.active_windows[wk] = self._new_window(pair_key, direction, market_pair_label,
-                                                       now_iso, spread_val)
+            active[wk] = self._new_window(pair_key, direction, market_pair_label,
+                                          now_iso, spread_val)
         else:
-            w["last_time"] = now_iso
-            w["observation_count"] += 1
-            w["sum_spread"] += spread_val
-            if spread_val > w["peak_spread"]:
-                w["peak_spread"] = spread_val
+            w.last_time = now_iso
+            w.observation_count += 1
+            w.sum_spread += spread_val
+            if spread_val > w.peak_spread:
+                w.peak_spread = spread_val
+
+    def _finalize_row(self, w: _Window, end_iso: str, end_dt: datetime.datetime,
+                      interrupted: bool) -> Dict:
+        """把进行中窗口转换为 opportunity_windows.csv 的一行"""
+        start_dt = _parse_iso(w.start_time)
+        duration_sec = max(0, int((end_dt - start_dt).total_seconds()))
+        observation_count = w.observation_count
+        return {
+            "window_id": w.window_id,
+            "market_pair": w.market_pair,
+            "start_time": w.start_time,
+            "end_time": end_iso,
+            "duration_seconds": duration_sec,
+            "peak_spread": f"{w.peak_spread:.6f}",
+            "avg_spread": f"{w.sum_spread / max(1, observation_count):.6f}",
+            "direction": self._dir_label(w.direction),
+            "observation_count": observation_count,
+            "interrupted": bool(interrupted),
+        }
 
     def close_if_open(self, pair_key: str, direction: str, end_iso: str, interrupted=False):
         wk = self._window_key(pair_key, direction)
         w = self.active_windows.pop(wk, None)
         if not w:
             return
-        start_dt = datetime.datetime.fromisoformat(w["start_time"])
-        end_dt = datetime.datetime.fromisoformat(end_iso)
-        duration_sec = max(0, int((end_dt - start_dt).total_seconds()))
-        avg_spread = round(w["sum_spread"] / max(1, w["observation_count"]), 6)
+        end_dt = _parse_iso(end_iso)
+        # 关闭记录先留在缓冲区，由本轮结束时的 maybe_checkpoint 统一落盘
+        self._window_writer.writerow(self._finalize_row(w, end_iso, end_dt, interrupted))
 
-        row = {
-            "window_id": w["window_id"],
-            "market_pair": w["market_pair"],
-            "start_time": w["start_time"],
-            "end_time": end_iso,
-            "duration_seconds": duration_sec,
-            "peak_spread": round(w["peak_spread"], 6),
-            "avg_spread": avg_spread,
-            "direction": self._dir_label(w["direction"]),
-            "observation_count": w["observation_count"],
-            "interrupted": bool(interrupted),
-        }
-        _append_csv_row(OPP_WINDOWS_CSV, WINDOW_HEADERS, row)
+    def close_all(self, end_iso: str, interrupted=True) -> int:
+        """结束全部进行中窗口（如退出时），一次性批量写入 CSV"""
+        rows = []
+        if self.active_windows:
+            end_dt = _parse_iso(end_iso)
+            windows = list(self.active_windows.values())
+            self.active_windows.clear()
+            rows = [self._finalize_row(w, end_iso, end_dt, interrupted) for w in windows]
+            self._window_writer.writerows(rows)
+            self._window_fh.flush()
+        # 窗口已全部落盘，删除检查点，避免重启后恢复并重复关闭同一窗口
+        WINDOW_STATE_JSON.unlink(missing_ok=True)
+        return len(rows)
 
     def write_snapshot(self, market_pair_label: str, kb: float, ka: float,
                        pb: float, pa: float, total_cost: float,
@@ -167,90 +248,84 @@ class OpportunityWindowManager:
         row = {
             "timestamp": now_iso,
             "market_pair": market_pair_label,
-            "kalshi_bid": round(kb, 6),
-            "kalshi_ask": round(ka, 6),
-            "poly_bid": round(pb, 6),
-            "poly_ask": round(pa, 6),
-            "total_cost": round(total_cost, 6),
-            "net_spread_buy_K_sell_P": round(buy_k_sell_p, 6),
-            "net_spread_buy_P_sell_K": round(buy_p_sell_k, 6),
+            "kalshi_bid": f"{kb:.6f}",
+            "kalshi_ask": f"{ka:.6f}",
+            "poly_bid": f"{pb:.6f}",
+            "poly_ask": f"{pa:.6f}",
+            "total_cost": f"{total_cost:.6f}",
+            "net_spread_buy_K_sell_P": f"{buy_k_sell_p:.6f}",
+            "net_spread_buy_P_sell_K": f"{buy_p_sell_k:.6f}",
         }
-        _append_csv_row(PRICE_SNAPSHOTS_CSV, SNAPSHOT_HEADERS, row)
+        self._snapshot_writer.writerow(row)
 
     # ---------- 状态持久化 ----------
     def maybe_checkpoint(self):
+        # 每轮调用一次：本轮的快照与窗口关闭记录各合并为一次写入，
+        # 进程被直接终止（如 docker stop）时最多丢失当前一轮
+        self._snapshot_fh.flush()
+        self._window_fh.flush()
         now = time.time()
         if now - self.last_checkpoint_ts < self.checkpoint_interval_sec:
             return
+        # 检查点只是可重建的缓存（行情源才是事实来源），直接覆盖写、不 fsync，
+        # 避免阻塞轮询；写坏的文件在加载时按缺失处理
         payload = {
             "last_updated": _utc_now_iso(),
-            "active_windows": list(self.active_windows.values()),
+            "active_windows": [
+                {k: getattr(w, k) for k in STATE_FIELDS} for w in self.active_windows.values()
+            ],
         }
-        with WINDOW_STATE_JSON.open("w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+        WINDOW_STATE_JSON.write_bytes(jsonio.dumps(payload))
         self.last_checkpoint_ts = now
 
-    def load_or_recover(self):
-        if not WINDOW_STATE_JSON.exists():
-            return
+    def load_or_recover(self, pair_labels: Optional[Mapping[str, str]] = None):
+        """
+        从 window_state.json 恢复进行中窗口；pair_labels 为 pair_key -> 市场对名称，
+        用于重建检查点中省略的 market_pair 字段
+        """
         try:
-            with WINDOW_STATE_JSON.open("r", encoding="utf-8") as f:
-                state = json.load(f)
+            try:
+                state = jsonio.loads(WINDOW_STATE_JSON.read_bytes())
+            except FileNotFoundError:
+                return
+            except ValueError:
+                logger.warning("检查点文件损坏（可能写入中断），忽略并从空状态开始。")
+                return
 
             last_updated = state.get("last_updated")
             active_windows = state.get("active_windows", [])
             if not last_updated or not isinstance(active_windows, list):
                 return
 
+            labels = pair_labels or {}
+
+            def label_of(state_w: Mapping) -> str:
+                # 优先使用当前配置中的名称；旧版检查点自带的 market_pair 作为回退
+                return labels.get(state_w.get("pair_key")) or state_w.get("market_pair") or "Unknown"
+            now_dt = datetime.datetime.now(datetime.timezone.utc)
             last_dt = datetime.datetime.fromisoformat(last_updated)
-            delta_sec = abs(
-                (datetime.datetime.now(datetime.timezone.utc) - last_dt).total_seconds()
-            )
+            delta_sec = abs((now_dt - last_dt).total_seconds())
 
             if delta_sec <= 300:
                 self.active_windows = {}
-                for w in active_windows:
-                    if all(
-                        k in w
-                        for k in (
-                            "window_id",
-                            "market_pair",
-                            "direction",
-                            "start_time",
-                            "last_time",
-                            "pair_key",
-                        )
-                    ):
-                        wk = self._window_key(w["pair_key"], w["direction"])
-                        self.active_windows[wk] = w
+                for state_w in active_windows:
+                    if all(k in state_w for k in STATE_FIELDS):
+                        w = _window_from_state(state_w, label_of(state_w))
+                        self.active_windows[self._window_key(w.pair_key, w.direction)] = w
                 logger.info("恢复 %d 个进行中窗口。", len(self.active_windows))
             else:
-                now_iso = _utc_now_iso()
-                forced = 0
-                for w in active_windows:
+                now_iso = now_dt.isoformat()
+                rows = []
+                for state_w in active_windows:
                     try:
-                        start_dt = datetime.datetime.fromisoformat(w["start_time"])
-                        end_dt = datetime.datetime.fromisoformat(now_iso)
-                        duration_sec = max(0, int((end_dt - start_dt).total_seconds()))
-                        avg_spread = round(
-                            w.get("sum_spread", 0.0) / max(1, w.get("observation_count", 1)), 6
-                        )
-                        row = {
-                            "window_id": w.get("window_id", f"forced-{int(time.time())}"),
-                            "market_pair": w.get("market_pair", "Unknown"),
-                            "start_time": w.get("start_time", now_iso),
-                            "end_time": now_iso,
-                            "duration_seconds": duration_sec,
-                            "peak_spread": round(w.get("peak_spread", 0.0), 6),
-                            "avg_spread": avg_spread,
-                            "direction": self._dir_label(w.get("direction", "K_to_P")),
-                            "observation_count": int(w.get("observation_count", 1)),
-                            "interrupted": True,
-                        }
-                        _append_csv_row(OPP_WINDOWS_CSV, WINDOW_HEADERS, row)
-                        forced += 1
+                        w = _window_from_state(state_w, label_of(state_w))
+                        rows.append(self._finalize_row(w, now_iso, now_dt, interrupted=True))
                     except Exception:
                         logger.exception("Failed to force-close expired window state")
+                if rows:
+                    self._window_writer.writerows(rows)
+                    self._window_fh.flush()
+                forced = len(rows)
                 if forced:
                     logger.warning("检测到过期状态，强制结束 %d 个窗口。", forced)
                 WINDOW_STATE_JSON.unlink(missing_ok=True)
@@ -2,7 +2,10 @@ import json
 import logging
 from typing import Any
 
-import requests
+import aiohttp
+
+from utils import jsonio
+from utils.http import SESSION
 
 
 logger = logging.getLogger(__name__)
@@ -15,24 +18,31 @@ get_market_by_id_url = f"{polymarket_baseurl}/markets/{{market_id}}"
 
 def get_market_list() -> Any:
     """获取所有市场列表"""
-    response = requests.get(list_market_url)
+    response = SESSION.get(list_market_url)
     return response.json()
 
 
 def get_market_by_id(market_id: str) -> Any:
     """根据市场 ID 获取市场详情"""
     url = get_market_by_id_url.format(market_id=market_id)
-    response = requests.get(url)
+    response = SESSION.get(url)
     return response.json()
 
 
 def get_market_public_search(querystring: str) -> Any:
     """根据问题关键词搜索市场"""
     params = {"q": querystring}
-    response = requests.get(public_search_url, params=params)
+    response = SESSION.get(public_search_url, params=params)
     return response.json()
 
 
+async def get_market_public_search_async(session: aiohttp.ClientSession, querystring: str) -> Any:
+    """根据问题关键词搜索市场（异步，复用调用方的 session）"""
+    params = {"q": querystring}
+    async with session.get(public_search_url, params=params) as response:
+        return jsonio.loads(await response.read())
+
+
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
     market_list = get_market_list()
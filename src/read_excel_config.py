@@ -1,20 +1,30 @@
-import json
+import asyncio
 import logging
-import re
-from dataclasses import asdict, dataclass
+import sys
+import time
+from dataclasses import asdict, dataclass, fields
 from pathlib import Path
 
+import aiohttp
 import pandas as pd
 
 from models import MarketPair
-from polymarket_api import get_market_public_search
-from kalshi_api import get_event_by_event_ticker
+from utils import jsonio
+from polymarket_api import get_market_public_search_async
+from kalshi_api import get_event_by_event_ticker_async
 
 
 logger = logging.getLogger(__name__)
 
+# 同时进行的 HTTP 请求上限，避免对上游 API 造成突发压力
+MAX_CONCURRENT_REQUESTS = 16
 
-@dataclass
+# Polymarket 搜索结果的磁盘缓存，重复运行时相同标题不再请求
+SEARCH_CACHE_PATH = Path(".cache") / "poly_search.json"
+SEARCH_CACHE_TTL_SEC = 86400
+
+
+@dataclass(slots=True)
 class Pair:
     id: str
     type: str
@@ -27,7 +37,12 @@ class Pair:
     polymarket_url: str
     notes: str
 
-@dataclass
+    def __post_init__(self):
+        # 类型/状态只有少量取值，驻留后所有行共享同一字符串对象
+        self.type = sys.intern(self.type)
+        self.status = sys.intern(self.status)
+
+@dataclass(slots=True)
 class MarketPairMapping:
     """定义 Excel 列名与 dataclass 字段的对应关系"""
     type_col: str = "类型"
@@ -41,43 +56,209 @@ class MarketPairMapping:
     notes_col: str = "验证备注"
 
 
-def load_market_pairs(excel_path: str, mapping: MarketPairMapping):
-    """从 Excel 文件加载市场配对表"""
+def _read_excel(excel_path: str, usecols) -> pd.DataFrame:
+    """
+    优先使用 calamine 引擎（Rust 实现，需安装 python-calamine），不可用时退回 openpyxl。
+    只读取需要的列，并以 str 读取以跳过类型推断
+    """
+    try:
+        return pd.read_excel(excel_path, engine="calamine", usecols=usecols, dtype=str)
+    except ImportError:
+        return pd.read_excel(excel_path, engine="openpyxl", usecols=usecols, dtype=str)
 
-    df = pd.read_excel(excel_path)
-    df.columns = [col.strip() for col in df.columns]
 
-    # Pandas 在 itertuples() 时会将列名中的空格、符号替换成下划线
-    def normalize_col_name(col: str) -> str:
-        """模仿 Pandas 内部规则：空格和特殊字符替换为下划线"""
-        return re.sub(r'\W+', '_', col.strip())
+def load_market_pairs(excel_path: str, mapping: MarketPairMapping):
+    """从 Excel 文件加载市场配对表"""
 
-    attr_map = {col: normalize_col_name(col) for col in df.columns}
+    wanted = {getattr(mapping, f.name) for f in fields(mapping)}
+    df = _read_excel(excel_path, lambda col: str(col).strip() in wanted)
+    df.columns = [str(col).strip() for col in df.columns]
 
-    df.columns = list(attr_map.values())
+    def column(col_name: str) -> list[str]:
+        """按列整体转换为去除首尾空白的字符串；缺失列或空单元格视为空串"""
+        if col_name not in df.columns:
+            return [""] * len(df)
+        return df[col_name].fillna("").astype(str).str.strip().tolist()
 
-    def get_attr(row, col_name: str, default=""):
-        # 根据 mapping 中原始列名找到对应的 tuple 属性名
-        attr_name = attr_map.get(col_name, "")
-        return getattr(row, attr_name, default)
+    rows = zip(
+        column(mapping.type_col),
+        column(mapping.kalshi_title_col),
+        column(mapping.kalshi_market_col),
+        column(mapping.polymarket_title_col),
+        column(mapping.poymarket_market_col),
+        column(mapping.status_col),
+        column(mapping.kalshi_url_col),
+        column(mapping.polymarket_url_col),
+        column(mapping.notes_col),
+    )
 
-    pairs = []
-    for i, row in enumerate(df.itertuples(index=False), start=1):
-        pair = Pair(
+    return [
+        Pair(
             id=f"pair_{i:03d}",
-            type=get_attr(row, mapping.type_col),
-            kalshi_title=get_attr(row, mapping.kalshi_title_col),
-            kalshi_market=get_attr(row, mapping.kalshi_market_col),
-            polymarket_title=get_attr(row, mapping.polymarket_title_col),
-            polymarket_market=get_attr(row, mapping.poymarket_market_col),
-            status=get_attr(row, mapping.status_col),
-            kalshi_url=get_attr(row, mapping.kalshi_url_col),
-            polymarket_url=get_attr(row, mapping.polymarket_url_col),
-            notes=get_attr(row, mapping.notes_col)
+            type=type_,
+            kalshi_title=kalshi_title,
+            kalshi_market=kalshi_market,
+            polymarket_title=polymarket_title,
+            polymarket_market=polymarket_market,
+            status=status,
+            kalshi_url=kalshi_url,
+            polymarket_url=polymarket_url,
+            notes=notes
         )
-        pairs.append(pair)
+        for i, (type_, kalshi_title, kalshi_market, polymarket_title, polymarket_market,
+                status, kalshi_url, polymarket_url, notes) in enumerate(rows, start=1)
+    ]
+
+
+def _index_polymarket_markets(event: dict) -> dict[str, str]:
+    """groupItemTitle -> 市场 ID，同名时保留第一个"""
+    index: dict[str, str] = {}
+    for market in event.get('markets', []):
+        index.setdefault(market.get('groupItemTitle'), market.get('id'))
+    return index
+
+
+def _index_kalshi_markets(event: dict) -> dict[str, str]:
+    """子标题 -> 市场 ticker，同名时保留第一个"""
+    index: dict[str, str] = {}
+    for market in event.get('markets', []):
+        title = market.get('sub_title') or market.get('yes_sub_title') \
+                or market.get('no_sub_title')
+        index.setdefault(title, market.get('ticker'))
+    return index
+
+
+class _SearchDiskCache:
+    """按规范化标题缓存 Polymarket 搜索命中的事件，落盘为 JSON 文件，过期时间 SEARCH_CACHE_TTL_SEC"""
+
+    def __init__(self, path: Path = SEARCH_CACHE_PATH, ttl_sec: int = SEARCH_CACHE_TTL_SEC):
+        self.path = path
+        self.ttl_sec = ttl_sec
+        self._entries: dict[str, dict] = {}
+        self._dirty = False
+        if path.exists():
+            try:
+                self._entries = jsonio.loads(path.read_bytes())
+            except (OSError, ValueError):
+                logger.warning("忽略无法读取的搜索缓存 %s", path)
+
+    @staticmethod
+    def _key(title: str) -> str:
+        return " ".join(str(title).lower().split())
+
+    def get(self, title: str) -> dict | None:
+        entry = self._entries.get(self._key(title))
+        if entry and time.time() - entry.get("ts", 0) < self.ttl_sec:
+            return entry.get("event")
+        return None
 
-    return pairs
+    def put(self, title: str, event: dict) -> None:
+        self._entries[self._key(title)] = {"ts": time.time(), "event": event}
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        now = time.time()
+        fresh = {k: v for k, v in self._entries.items() if now - v.get("ts", 0) < self.ttl_sec}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_bytes(jsonio.dumps(fresh))
+        self._dirty = False
+
+
+class _LookupCache:
+    """
+    单次 main() 运行内的请求去重：同一 Polymarket 标题 / Kalshi ticker 只请求并建索引一次，
+    并发的重复查询共享同一个进行中的 Task
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                 search_cache: _SearchDiskCache):
+        self.session = session
+        self.semaphore = semaphore
+        self.search_cache = search_cache
+        self._poly_events: dict[str, asyncio.Task] = {}
+        self._poly_refreshed: dict[str, asyncio.Task] = {}
+        self._kalshi_events: dict[str, asyncio.Task] = {}
+
+    async def _fetch_polymarket_event(self, title: str,
+                                      use_cache: bool) -> tuple[dict, dict[str, str], bool]:
+        """返回 (事件, 子市场索引, 是否来自磁盘缓存)"""
+        event = self.search_cache.get(title) if use_cache else None
+        from_cache = event is not None
+        if event is None:
+            async with self.semaphore:
+                search = await get_market_public_search_async(self.session, title)
+            event = search.get('events')[0]
+            self.search_cache.put(title, event)
+        return event, _index_polymarket_markets(event), from_cache
+
+    async def _fetch_kalshi_event(self, event_ticker: str) -> dict[str, str]:
+        async with self.semaphore:
+            event = await get_event_by_event_ticker_async(self.session, event_ticker)
+        return _index_kalshi_markets(event)
+
+    def polymarket_event(self, title: str, refresh: bool = False) -> asyncio.Task:
+        """refresh=True 时跳过磁盘缓存重新搜索（同样按标题去重）"""
+        tasks = self._poly_refreshed if refresh else self._poly_events
+        task = tasks.get(title)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_polymarket_event(title, use_cache=not refresh))
+            tasks[title] = task
+        return task
+
+    def kalshi_markets(self, event_ticker: str) -> asyncio.Task:
+        task = self._kalshi_events.get(event_ticker)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_kalshi_event(event_ticker))
+            self._kalshi_events[event_ticker] = task
+        return task
+
+
+async def _resolve_pair_async(p: Pair, lookups: _LookupCache) -> MarketPair:
+    """并发查询 Polymarket 与 Kalshi，解析出一条 MarketPair"""
+    kalshi_ticker = p.kalshi_url.rstrip("/").split("/")[-1].upper()
+    (events, poly_index, from_cache), kalshi_index = await asyncio.gather(
+        lookups.polymarket_event(p.polymarket_title),
+        lookups.kalshi_markets(kalshi_ticker),
+    )
+
+    polymarket_market_id = poly_index.get(p.polymarket_market)
+    if not polymarket_market_id and from_cache:
+        # 缓存的事件可能早于新上线的子市场：未命中时绕过缓存重新搜索一次
+        events, poly_index, _ = await lookups.polymarket_event(p.polymarket_title, refresh=True)
+        polymarket_market_id = poly_index.get(p.polymarket_market)
+    polymarket_market_id = polymarket_market_id or ""
+    polymarket_token = events.get('id')
+    settlement_date = events.get('endDate')
+    kalshi_market_id = kalshi_index.get(p.kalshi_market) or ""
+
+    return MarketPair(
+        id=p.id,
+        polymarket_token=polymarket_token,
+        kalshi_ticker=kalshi_ticker,
+        market_name=p.polymarket_title,
+        settlement_date=settlement_date,
+        manually_verified=True,
+        polymarket_market_id=polymarket_market_id,
+        kalshi_market_id=kalshi_market_id,
+        notes=p.notes
+    )
+
+
+async def _resolve_pairs_async(pairs: list[Pair]) -> list[MarketPair]:
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_REQUESTS)
+    timeout = aiohttp.ClientTimeout(total=30)
+    # aiohttp 默认不读取代理环境变量，需要 trust_env=True
+    async with aiohttp.ClientSession(trust_env=True, connector=connector, timeout=timeout) as session:
+        search_cache = _SearchDiskCache()
+        lookups = _LookupCache(session, semaphore, search_cache)
+        try:
+            return await asyncio.gather(*(_resolve_pair_async(p, lookups) for p in pairs))
+        finally:
+            # 部分失败时也保存已成功的搜索结果，下次运行可直接复用
+            search_cache.save()
 
 
 def main():
@@ -87,44 +268,10 @@ def main():
     mapping = MarketPairMapping()
     pairs = load_market_pairs(str(input_file), mapping)
 
-    marketPairs = []
-    for p in pairs:
-        events = get_market_public_search(p.polymarket_title).get('events')[0]
-        markets = events.get('markets', [])
-        polymarket_market_id = ""
-        for market in markets:
-            if market.get('groupItemTitle') == p.polymarket_market:
-                polymarket_market_id = market.get('id')
-                break
-
-        polymarket_token = events.get('id')
-        settlement_date = events.get('endDate')
-
-        kalshi_ticker = p.kalshi_url.rstrip("/").split("/")[-1].upper()
-        kalshi_markets = get_event_by_event_ticker(kalshi_ticker).get('markets', [])
-        kalshi_market_id = ""
-        for kalshi_market in kalshi_markets:
-            title = kalshi_market.get('sub_title') or kalshi_market.get('yes_sub_title') \
-                    or kalshi_market.get('no_sub_title')
-            if title == p.kalshi_market:
-                kalshi_market_id = kalshi_market.get('ticker')
-                break
-
-        marketPairs.append(MarketPair(
-            id=p.id,
-            polymarket_token=polymarket_token,
-            kalshi_ticker=kalshi_ticker,
-            market_name=p.polymarket_title,
-            settlement_date=settlement_date,
-            manually_verified=True,
-            polymarket_market_id=polymarket_market_id,
-            kalshi_market_id=kalshi_market_id,
-            notes=p.notes
-        ))
-    
+    marketPairs = asyncio.run(_resolve_pairs_async(pairs))
+
     if config_path.exists():
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
+        config = jsonio.loads(config_path.read_bytes())
     else:
         config = {}
 
@@ -132,8 +279,7 @@ def main():
     config["market_pairs"] = [asdict(mp) for mp in marketPairs]
 
     # 写回 JSON 文件（格式化输出）
-    with open(config_path, "w", encoding="utf-8") as f:
-        json.dump(config, f, ensure_ascii=False, indent=2)
+    config_path.write_bytes(jsonio.dumps(config, indent=True))
 
     logger.info(
         "已更新 %s 中的 market_pairs (%d 条)",
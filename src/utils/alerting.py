@@ -1,9 +1,24 @@
-import json
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import jsonio
+from utils.http import SESSION
+
+# 推送在后台线程执行，调用方无需等待 Telegram 响应
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="telegram-alert")
+
+
+def _post(url: str, body: dict):
+    try:
+        SESSION.post(url, json=body, timeout=5)
+    except Exception:
+        # 静默失败，不影响主流程
+        pass
+
 
 def maybe_send_telegram(cfg_alerting: dict, payload: dict):
     """
     如果 alerting.enabled = True 且 token/chat_id 均存在，则把 payload 作为文本推送到 Telegram。
+    推送为后台异步执行，本函数立即返回。
     """
     if not cfg_alerting or not cfg_alerting.get("enabled"):
         return
@@ -13,10 +28,6 @@ def maybe_send_telegram(cfg_alerting: dict, payload: dict):
     if not token or not chat_id:
         return
 
-    text = "⚡ Arbitrage opportunity!\n" + json.dumps(payload, ensure_ascii=False, indent=2)
+    text = "⚡ Arbitrage opportunity!\n" + jsonio.dumps(payload).decode("utf-8")
     url = f"https://api.telegram.org/bot{token}/sendMessage"
-    try:
-        requests.post(url, json={"chat_id": chat_id, "text": text}, timeout=5)
-    except Exception:
-        # 静默失败，不影响主流程
-        pass
+    _EXECUTOR.submit(_post, url, {"chat_id": chat_id, "text": text})
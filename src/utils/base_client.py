@@ -2,6 +2,10 @@ import time
 import logging
 from datetime import datetime, timezone
 
+import requests
+
+from .http import SESSION
+
 class BaseAPIClient:
     def __init__(self, name: str, base_url: str, polling_interval: int):
         self.name = name
@@ -9,6 +13,35 @@ class BaseAPIClient:
         self.interval = polling_interval
         self.last_429_time = None
         self.retry_count = 0
+        self.session = SESSION
+        # url -> (ETag, Last-Modified, 上次解析结果)，用于条件请求
+        self._validator_cache: dict[str, tuple[str | None, str | None, list]] = {}
+
+    def _conditional_headers(self, url: str) -> dict[str, str]:
+        """附带上次响应的 ETag / Last-Modified，数据未变化时服务端返回 304"""
+        cached = self._validator_cache.get(url)
+        if not cached:
+            return {}
+        etag, last_modified, _ = cached
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def _cached_result(self, url: str) -> list:
+        """304 时复用上次的解析结果，跳过下载与解析"""
+        cached = self._validator_cache.get(url)
+        return cached[2] if cached else []
+
+    def _remember_validators(self, url: str, response: requests.Response, parsed: list):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._validator_cache[url] = (etag, last_modified, parsed)
+        else:
+            self._validator_cache.pop(url, None)
 
     def handle_rate_limit(self):
         """统一退避机制"""
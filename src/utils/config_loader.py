@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-import json
+import functools
+import os
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any
 
 from models import (
     AppConfig,
@@ -13,10 +14,26 @@ from models import (
     MonitoringConfig,
     TelegramSettings,
 )
+from utils import jsonio
+
+
+_MARKET_PAIR_REQUIRED = frozenset(
+    {
+        "id",
+        "market_name",
+        "polymarket_token",
+        "polymarket_market_id",
+        "kalshi_ticker",
+        "kalshi_market_id",
+        "settlement_date",
+    }
+)
+_MONITORING_REQUIRED = frozenset({"polling_interval_seconds", "monitoring_duration_hours"})
+_COST_REQUIRED = frozenset({"gas_fee_per_trade_usd"})
 
 
-def _require(obj: dict[str, Any], keys: Iterable[str], context: str) -> None:
-    missing = [key for key in keys if key not in obj]
+def _require(obj: dict[str, Any], required: frozenset[str], context: str) -> None:
+    missing = required - obj.keys()
     if missing:
         joined = ", ".join(sorted(missing))
         raise ValueError(f"{context} missing required field(s): {joined}")
@@ -31,19 +48,7 @@ def _load_market_pairs(raw_pairs: Any) -> list[MarketPair]:
         if not isinstance(entry, dict):
             raise ValueError(f"market_pairs[{idx}] must be an object")
 
-        _require(
-            entry,
-            (
-                "id",
-                "market_name",
-                "polymarket_token",
-                "polymarket_market_id",
-                "kalshi_ticker",
-                "kalshi_market_id",
-                "settlement_date",
-            ),
-            f"market_pairs[{idx}]",
-        )
+        _require(entry, _MARKET_PAIR_REQUIRED, f"market_pairs[{idx}]")
 
         pairs.append(
             MarketPair(
@@ -69,13 +74,11 @@ def _load_monitoring(raw_monitoring: Any) -> MonitoringConfig:
         raise ValueError("`monitoring` must be an object")
 
     if "monitoring_duration_hours" not in raw_monitoring and "duration_hours" in raw_monitoring:
+        # 不修改传入的 dict：它可能是 load_config_raw 缓存的共享对象
+        raw_monitoring = dict(raw_monitoring)
         raw_monitoring["monitoring_duration_hours"] = raw_monitoring.pop("duration_hours")
 
-    _require(
-        raw_monitoring,
-        ("polling_interval_seconds", "monitoring_duration_hours"),
-        "monitoring",
-    )
+    _require(raw_monitoring, _MONITORING_REQUIRED, "monitoring")
 
     try:
         interval = int(raw_monitoring["polling_interval_seconds"])
@@ -98,7 +101,7 @@ def _load_cost_assumptions(raw_cost: Any) -> CostAssumptions:
     if not isinstance(raw_cost, dict):
         raise ValueError("`cost_assumptions` must be an object")
 
-    _require(raw_cost, ("gas_fee_per_trade_usd",), "cost_assumptions")
+    _require(raw_cost, _COST_REQUIRED, "cost_assumptions")
 
     try:
         gas_fee = float(raw_cost["gas_fee_per_trade_usd"])
@@ -125,10 +128,22 @@ def _load_telegram(raw_cfg: dict[str, Any]) -> TelegramSettings:
     )
 
 
+@functools.lru_cache(maxsize=4)
+def _read_raw(path: str, mtime_ns: int) -> dict[str, Any]:
+    return jsonio.loads(Path(path).read_bytes())
+
+
+def load_config_raw(path: str = "config.json") -> dict[str, Any]:
+    """Return the parsed config dict, re-reading the file only when its mtime changes.
+
+    The returned dict is shared between callers and must be treated as read-only.
+    """
+
+    return _read_raw(path, os.stat(path).st_mtime_ns)
+
+
 def load_config(path: str = "config.json") -> AppConfig:
-    config_path = Path(path)
-    with config_path.open("r", encoding="utf-8") as handle:
-        raw: dict[str, Any] = json.load(handle)
+    raw = load_config_raw(path)
 
     if "market_pairs" not in raw:
         raise ValueError("Missing top-level key: market_pairs")
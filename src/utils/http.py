@@ -0,0 +1,31 @@
+"""Process-wide HTTP session shared by all API clients and helpers."""
+
+from __future__ import annotations
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def _build_session() -> requests.Session:
+    """复用 HTTP 连接（keep-alive），并对网关类 5xx 做有限次退避重试"""
+    session = requests.Session()
+    session.headers.update({"Accept": "application/json"})
+    # read=0：读超时不重试，单个卡住的请求最多占用一次 timeout，不会拖住整轮轮询
+    retry = Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=("GET",),
+        raise_on_status=False,
+    )
+    # pool_connections 为缓存的主机连接池数量，pool_maxsize 为每个主机的连接上限
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# 不要在 SESSION.headers 中放置任何凭据：它被所有主机共享，凭据应随单次请求传入
+SESSION = _build_session()
@@ -0,0 +1,29 @@
+"""JSON encode/decode helpers: use orjson when installed, otherwise the stdlib json."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # orjson 为可选加速依赖
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 bytes; non-ASCII text is kept as-is (like ensure_ascii=False)."""
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        text = json.dumps(obj, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
@@ -3,18 +3,41 @@
 from __future__ import annotations
 
 import logging
+import sys
 import time
-from datetime import datetime, timezone
 from typing import Any, Dict, List
 
 import requests
 
+from models import ParsedMarket
+
+from . import jsonio
 from .base_client import BaseAPIClient
 
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _to_float(value: Any, default: float) -> float:
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+_TITLE_KEYS = ("title", "subtitle", "yes_sub_title", "no_sub_title", "ticker")
+
+
+def _pick_title(entry: Dict[str, Any]) -> str:
+    for key in _TITLE_KEYS:
+        candidate = entry.get(key)
+        if isinstance(candidate, str) and (stripped := candidate.strip()):
+            return stripped.replace("$", "").strip() if "$" in stripped else stripped
+    return "Unknown"
+
+
 class KalshiClient(BaseAPIClient):
     """Thin wrapper around the Kalshi event API with rate-limit awareness."""
 
@@ -25,26 +48,40 @@ class KalshiClient(BaseAPIClient):
         super().__init__(name="Kalshi", base_url=base_url, polling_interval=polling_interval)
         self.api_key = api_key
         self.retry_count = 0
+        # 会话为全局共享，凭据只随 Kalshi 请求发送
+        self._auth_headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
         self.last_retry_ts = 0.0
 
-    def fetch_event_markets(self, event_ticker: str) -> List[Dict[str, Any]]:
+    def fetch_event_markets(self, event_ticker: str, include_raw: bool = False) -> List[ParsedMarket]:
+        """Return the parsed markets of an event; ``raw`` payloads are kept only if requested."""
+
         url = f"{self.base_url}/events/{event_ticker}"
-        headers = {"Accept": "application/json"}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
 
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            # Cached 304 results carry no raw payloads, so raw callers always do a full GET.
+            headers = self._auth_headers if include_raw else self._auth_headers | self._conditional_headers(url)
+            response = self.session.get(url, headers=headers, timeout=10)
+            status = response.status_code
 
-            if response.status_code == self.RATE_LIMIT_STATUS:
+            if status == self.RATE_LIMIT_STATUS:
                 self._register_retry()
                 self.handle_rate_limit()
                 LOGGER.warning("[Kalshi] HTTP 429 (rate limited). retry_count=%s", self.retry_count)
                 return []
 
-            response.raise_for_status()
-            markets = (response.json() or {}).get("markets") or []
-            parsed = [market for market in map(self._parse_market, markets) if market]
+            if status == 304:
+                parsed = self._cached_result(url)
+            else:
+                if status >= 400:
+                    raise requests.HTTPError(f"HTTP {status}", response=response)
+                markets = (jsonio.loads(response.content) or {}).get("markets") or []
+                parsed = [
+                    parsed_market
+                    for market in markets
+                    if (parsed_market := self._parse_market(market, include_raw))
+                ]
+                if not include_raw:
+                    self._remember_validators(url, response, parsed)
 
             if self.retry_count:
                 LOGGER.info("[Kalshi] ✅ 请求恢复正常，重试计数清零 (was %s)", self.retry_count)
@@ -54,12 +91,11 @@ class KalshiClient(BaseAPIClient):
         except Exception as exc:  # noqa: BLE001
             self._register_retry()
             LOGGER.error(
-                {
-                    "source": "Kalshi",
-                    "error": str(exc),
-                    "retry_count": self.retry_count,
-                    "time": datetime.now(timezone.utc).isoformat(),
-                }
+                "[Kalshi] event %s fetch failed: %s (retry_count=%s)",
+                event_ticker,
+                exc,
+                self.retry_count,
+                extra={"source": self.name},
             )
             return []
 
@@ -77,31 +113,17 @@ class KalshiClient(BaseAPIClient):
         self.last_retry_ts = time.time()
 
     @staticmethod
-    def _parse_market(market: Dict[str, Any]) -> Dict[str, Any] | None:
-        def to_float(value, default):
-            if value is None:
-                return default
-            try:
-                return float(str(value).strip('"'))
-            except Exception:  # noqa: BLE001
-                return default
-
-        def pick_title(entry: Dict[str, Any]) -> str:
-            for key in ("title", "subtitle", "yes_sub_title", "no_sub_title", "ticker"):
-                candidate = entry.get(key)
-                if isinstance(candidate, str) and candidate.strip():
-                    return candidate.strip().replace("$", "").strip()
-            return "Unknown"
-
-        bid = to_float(market.get("yes_bid_dollars"), 0.0)
-        ask = to_float(market.get("yes_ask_dollars"), 1.0)
-
-        if not (0 <= bid <= 1 and 0 <= ask <= 1 and bid <= ask):
+    def _parse_market(market: Dict[str, Any], include_raw: bool = False) -> ParsedMarket | None:
+        bid = _to_float(market.get("yes_bid_dollars"), 0.0)
+        ask = _to_float(market.get("yes_ask_dollars"), 1.0)
+
+        if not (0 <= bid <= ask <= 1):
             return None
 
-        return {
-            "title": pick_title(market),
-            "bid": bid,
-            "ask": ask,
-            "raw": market,
-        }
+        return ParsedMarket(
+            id=str(market.get("ticker") or ""),
+            title=sys.intern(_pick_title(market)),
+            bid=bid,
+            ask=ask,
+            raw=market if include_raw else None,
+        )
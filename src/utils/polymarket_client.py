@@ -1,9 +1,13 @@
 import json
 import logging
-from datetime import datetime, timezone
+import sys
+from dataclasses import asdict
 
 import requests
 
+from models import ParsedMarket
+
+from . import jsonio
 from .base_client import BaseAPIClient
 
 
@@ -12,27 +16,35 @@ logger = logging.getLogger(__name__)
 class PolymarketClient(BaseAPIClient):
     """
     /events/{id} -> 返回该事件下所有子市场
-    标准结构：{ "title": str, "bid": float, "ask": float, "raw": dict }
+    标准结构：ParsedMarket(id, title, bid, ask, raw)
     价格单位：0~1 美元
+    raw 默认不保留，需要原始字段时传 include_raw=True
     """
 
     def __init__(self, base_url: str, polling_interval: int):
         super().__init__(name="Polymarket", base_url=base_url, polling_interval=polling_interval)
 
-    def fetch_event_markets(self, event_id: str):
+    def fetch_event_markets(self, event_id: str, include_raw: bool = False):
         url = f"{self.base_url}/events/{event_id}"
         try:
-            resp = requests.get(url, timeout=10)
-            if resp.status_code == 429:
+            # 304 缓存的结果不含 raw，需要原始字段时走完整请求
+            headers = {} if include_raw else self._conditional_headers(url)
+            resp = self.session.get(url, headers=headers, timeout=10)
+            status = resp.status_code
+            if status == 429:
                 self.handle_rate_limit()
                 return []
-            resp.raise_for_status()
-            data = resp.json()
+            if status == 304:
+                return self._cached_result(url)
+            if status >= 400:
+                raise requests.HTTPError(f"HTTP {status}", response=resp)
+            data = jsonio.loads(resp.content)
             markets = data.get("markets") or []
 
             out = []
             for m in markets:
-                title = m.get("groupItemTitle") or m.get("question") or m.get("slug") or str(m.get("id"))
+                market_id = str(m.get("id") or "")
+                title = m.get("groupItemTitle") or m.get("question") or m.get("slug") or market_id
 
                 bid = m.get("bestBid")
                 ask = m.get("bestAsk")
@@ -42,8 +54,7 @@ class PolymarketClient(BaseAPIClient):
                     op = (m.get("outcomePrices") or "").strip()
                     if op.startswith("["):
                         try:
-                            parts = op.strip("[]").replace('"', '').split(",")
-                            vals = [float(x) for x in parts if x.strip() != ""]
+                            vals = [float(x) for x in jsonio.loads(op) if x != ""]
                             if len(vals) >= 2:
                                 bid, ask = min(vals), max(vals)
                         except Exception:
@@ -58,29 +69,30 @@ class PolymarketClient(BaseAPIClient):
                 except Exception:
                     continue
 
-                if not (0 <= bid <= 1 and 0 <= ask <= 1 and bid <= ask):
+                if not (0 <= bid <= ask <= 1):
                     continue
 
-                out.append({
-                    "title": title,
-                    "bid": bid,
-                    "ask": ask,
-                    "raw": m,
-                })
+                out.append(
+                    ParsedMarket(
+                        id=market_id,
+                        title=sys.intern(title),
+                        bid=bid,
+                        ask=ask,
+                        raw=m if include_raw else None,
+                    )
+                )
 
+            if not include_raw:
+                self._remember_validators(url, resp, out)
             logger.info("[Polymarket] event %s parsed %d markets.", event_id, len(out))
             return out
 
         except Exception as e:  # noqa: BLE001
             logger.error(
-                json.dumps(
-                    {
-                        "source": "Polymarket",
-                        "error": str(e),
-                        "time": datetime.now(timezone.utc).isoformat(),
-                    },
-                    ensure_ascii=False,
-                )
+                "[Polymarket] event %s fetch failed: %s",
+                event_id,
+                e,
+                extra={"source": self.name},
             )
             return []
 
@@ -91,7 +103,7 @@ if __name__ == "__main__":
     client = PolymarketClient(
         base_url="https://gamma-api.polymarket.com", polling_interval=2
     )
-    markets = client.fetch_event_markets("58873")
+    markets = client.fetch_event_markets("58873", include_raw=True)
     logger.info("markets: %d", len(markets))
     for market in markets:
-        logger.debug(json.dumps(market, ensure_ascii=False))
+        logger.debug(json.dumps(asdict(market), ensure_ascii=False))